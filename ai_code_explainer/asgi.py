@@ -0,0 +1,45 @@
+"""
+ASGI config for ai_code_explainer project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_code_explainer.settings')
+
+django_application = get_asgi_application()
+
+# Serve static files in development, as runserver does
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+    django_application = ASGIStaticFilesHandler(django_application)
+
+from explainers.llm_client import close_client  # noqa: E402 (needs the app registry)
+
+
+async def application(scope, receive, send):
+    """Route HTTP to Django and handle the server's lifespan events ourselves."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
+
+
+async def _lifespan(receive, send):
+    # Django's handler only speaks HTTP. On shutdown, close the pooled LLM API
+    # client while the loop that owns its connections is still running.
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
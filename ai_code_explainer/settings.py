@@ -54,6 +54,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ai_code_explainer.wsgi.application'
+ASGI_APPLICATION = 'ai_code_explainer.asgi.application'
 
 # Database
 DATABASES = {
@@ -99,10 +100,29 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LLM_API_URL = config('LLM_API_URL', default='')
 LLM_API_KEY = config('LLM_API_KEY', default='')
 LLM_TEMPERATURE = config('LLM_TEMPERATURE', default=0.7, cast=float)
+# Maximum concurrent requests to the LLM provider per event loop
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=8, cast=int)
+
+# In-memory cache of explanations for repeat submissions of the same code
+LLM_CACHE_SIZE = config('LLM_CACHE_SIZE', default=1024, cast=int)
+LLM_CACHE_TTL = config('LLM_CACHE_TTL', default=3600, cast=int)  # 1 hour in seconds
+
+# Semantic cache for near-duplicate code (needs sentence-transformers and faiss-cpu)
+SEMANTIC_CACHE_ENABLED = config('SEMANTIC_CACHE_ENABLED', default=False, cast=bool)
+SEMANTIC_CACHE_MODEL = config('SEMANTIC_CACHE_MODEL', default='all-MiniLM-L6-v2')
+SEMANTIC_CACHE_THRESHOLD = config('SEMANTIC_CACHE_THRESHOLD', default=0.92, cast=float)
+SEMANTIC_CACHE_SIZE = config('SEMANTIC_CACHE_SIZE', default=10000, cast=int)  # entries per language
+
+# Store each explanation in the database (written in batches off the request path)
+PERSIST_EXPLANATIONS = config('PERSIST_EXPLANATIONS', default=False, cast=bool)
+PERSIST_BATCH_SIZE = config('PERSIST_BATCH_SIZE', default=100, cast=int)
+PERSIST_FLUSH_INTERVAL_MS = config('PERSIST_FLUSH_INTERVAL_MS', default=200, cast=int)
 
 # Rate limiting configuration
 RATE_LIMIT_REQUESTS = config('RATE_LIMIT_REQUESTS', default=30, cast=int)
 RATE_LIMIT_WINDOW = config('RATE_LIMIT_WINDOW', default=3600, cast=int)  # 1 hour in seconds
+# Shared rate limit store; falls back to per-process memory when empty
+REDIS_URL = config('REDIS_URL', default='')
 
 # Input validation
 MAX_CODE_LENGTH = config('MAX_CODE_LENGTH', default=20000, cast=int)  # 20 KB
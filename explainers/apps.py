@@ -0,0 +1,15 @@
+"""
+App configuration for explainers app.
+"""
+import atexit
+from django.apps import AppConfig
+
+
+class ExplainersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'explainers'
+    
+    def ready(self):
+        # Write explanations still queued for the background writer
+        from . import persistence
+        atexit.register(persistence.flush)
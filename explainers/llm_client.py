@@ -4,12 +4,113 @@ LLM client for code explanation service.
 This module handles communication with external LLM APIs and includes
 prompt engineering logic to extract structured responses.
 """
-import json
+import asyncio
+import functools
+import hashlib
+import random
 import re
-import time
-from typing import Dict, Optional, Tuple
-import requests
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+import orjson
+from cachetools import TTLCache
 from django.conf import settings
+from . import semantic_cache
+
+
+# Splits a response on its "### <name>" header lines in a single pass. Deeper
+# headings such as "#### <name>" count too. The result interleaves header
+# names and bodies: [prefix, name, body, name, body, ...]
+_SECTION_SPLIT_RE = re.compile(r'^[ \t]*#{3,}[ \t]*([^\n]*?)[ \t]*\n', re.MULTILINE)
+
+# Normalized header name -> result key
+_SECTION_KEYS = {
+    'explanation': 'explanation',
+    'error': 'errors',
+    'errors': 'errors',
+    'improved code': 'improved_code',
+}
+
+# Placeholder for each section missing from a response, in output order
+_SECTION_DEFAULTS = {
+    'explanation': "Explanation not available.",
+    'errors': "Error analysis not available.",
+    'improved_code': "# Improved code not available.",
+}
+
+# A complete "### <name>" header line, as seen by the streaming parser
+_HEADER_LINE_RE = re.compile(r'[ \t]*#{3,}[ \t]*(.*?)\s*')
+
+# Exact-match cache of successful explanations keyed by (language, code digest).
+# Shared by every event loop and worker thread in the process, hence the lock.
+_cache = TTLCache(maxsize=settings.LLM_CACHE_SIZE, ttl=settings.LLM_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# Words in a search result snippet that suggest it describes an error. Matched
+# as substrings, like the per-keyword checks it replaces ("errors", "debugging").
+_ERR_KW_RE = re.compile(r'error|bug|issue|problem|exception|crash', re.IGNORECASE)
+
+# Keep-alive pool shared by all requests handled on the same event loop.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+
+# Per-event-loop state. Under ASGI there is a single loop per process; sync
+# (WSGI) deployments run each async view in its own loop, and clients,
+# in-flight calls and semaphores must never be reused across loops.
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+# Provider calls in progress, keyed like the cache, so concurrent misses for
+# the same snippet share one call
+_inflight: Dict[asyncio.AbstractEventLoop, Dict[Tuple[str, bytes], asyncio.Task]] = {}
+_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+# Threaded WSGI servers run one loop per thread, so registries are shared
+# between threads and only mutated under this lock.
+_registry_lock = threading.Lock()
+
+
+def _loop_local(registry: Dict, factory):
+    """Return the registry entry for the running loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    value = registry.get(loop)
+    if value is None:
+        with _registry_lock:
+            value = registry.get(loop)
+            if value is None:
+                # Drop entries left behind by event loops that have since closed
+                for stale_loop in [candidate for candidate in registry if candidate.is_closed()]:
+                    del registry[stale_loop]
+                value = registry[loop] = factory()
+    return value
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client for the running event loop."""
+    return _loop_local(_clients, lambda: httpx.AsyncClient(timeout=30, limits=_HTTP_LIMITS))
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore capping in-flight provider requests on this loop."""
+    return _loop_local(_semaphores, lambda: asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY))
+
+
+async def _backoff(wait_time: float) -> None:
+    """
+    Sleep for about ``wait_time`` seconds before a retry.
+    
+    The delay is jittered to 50-150% so callers that were throttled together
+    do not all retry at the same moment.
+    """
+    await asyncio.sleep(wait_time * (0.5 + random.random()))
+
+
+async def close_client() -> None:
+    """
+    Close the pooled HTTP client bound to the running event loop, if any.
+    
+    Called by the ASGI application on lifespan shutdown.
+    """
+    with _registry_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 
 # Example prompt template with explicit markers for structured output
@@ -45,6 +146,15 @@ def factorial(n):
 """
 
 
+# The template split around the code, with the language pre-substituted for
+# each supported language, so building a prompt is a single concatenation
+_PROMPT_HEAD, _PROMPT_TAIL = PROMPT_TEMPLATE.split('{code}')
+_PROMPT_PREFIXES = {
+    language: _PROMPT_HEAD.replace('{language}', language)
+    for language in ('python', 'cpp')
+}
+
+
 def build_prompt(language: str, code: str) -> str:
     """
     Build a prompt for the LLM with the given code and language.
@@ -56,7 +166,10 @@ def build_prompt(language: str, code: str) -> str:
     Returns:
         Formatted prompt string
     """
-    return PROMPT_TEMPLATE.format(language=language, code=code)
+    prefix = _PROMPT_PREFIXES.get(language)
+    if prefix is None:
+        prefix = _PROMPT_HEAD.replace('{language}', language)
+    return ''.join((prefix, code, _PROMPT_TAIL))
 
 
 def parse_serper_response(serper_data: Dict, language: str, code: str) -> str:
@@ -85,26 +198,24 @@ def parse_serper_response(serper_data: Dict, language: str, code: str) -> str:
         if answer_text:
             explanation_parts.append(answer_text)
     
-    # Extract snippets from top results
-    for result in organic_results[:3]:
+    # One pass over the results: snippets from the top 3 explain the code,
+    # and any snippet mentioning a problem is collected as an error
+    for i, result in enumerate(organic_results):
+        explanation_full = i >= 3 or len(explanation_parts) >= 3
+        if explanation_full and len(error_parts) >= 3:
+            break
         snippet = result.get('snippet', '')
-        title = result.get('title', '')
-        if snippet:
-            explanation_parts.append(f"{title}: {snippet}")
+        if not explanation_full and snippet:
+            explanation_parts.append(f"{result.get('title', '')}: {snippet}")
+        if len(error_parts) < 3 and _ERR_KW_RE.search(snippet):
+            error_parts.append(snippet)
     
     # Build explanation
-    explanation = "Based on search results:\n\n" + "\n\n".join(explanation_parts[:3])
+    explanation = "Based on search results:\n\n" + "\n\n".join(explanation_parts)
     if not explanation_parts:
         explanation = f"Found {len(organic_results)} search results for {language} code. Review the code structure and common patterns."
     
-    # Try to identify common errors from search results
-    error_keywords = ['error', 'bug', 'issue', 'problem', 'exception', 'crash']
-    for result in organic_results:
-        snippet = result.get('snippet', '').lower()
-        if any(keyword in snippet for keyword in error_keywords):
-            error_parts.append(result.get('snippet', ''))
-    
-    errors = "\n- ".join(error_parts[:3]) if error_parts else "None identified from search results."
+    errors = "\n- ".join(error_parts) if error_parts else "None identified from search results."
     if error_parts:
         errors = "- " + errors
     
@@ -125,7 +236,7 @@ def parse_llm_response(response_text: str) -> Dict[str, str]:
     """
     Parse LLM response text into structured sections.
     
-    Uses regex to extract sections marked with ### headers.
+    Splits the text on ### headers in a single regex pass.
     Falls back gracefully if markers are missing.
     
     Args:
@@ -134,14 +245,21 @@ def parse_llm_response(response_text: str) -> Dict[str, str]:
     Returns:
         Dictionary with keys: explanation, errors, improved_code
     """
-    # Try to extract sections using markers
-    explanation_match = re.search(r'###\s*Explanation\s*\n(.*?)(?=###|$)', response_text, re.DOTALL | re.IGNORECASE)
-    errors_match = re.search(r'###\s*Errors?\s*\n(.*?)(?=###|$)', response_text, re.DOTALL | re.IGNORECASE)
-    improved_match = re.search(r'###\s*Improved\s+Code\s*\n(.*?)(?=###|$)', response_text, re.DOTALL | re.IGNORECASE)
+    # Plain text without markers: skip the regex pass entirely
+    if '###' not in response_text:
+        return dict(_SECTION_DEFAULTS)
+    
+    # Extract sections using markers; the first occurrence of a header wins
+    parts = _SECTION_SPLIT_RE.split(response_text)
+    sections = {}
+    for i in range(1, len(parts), 2):
+        key = _SECTION_KEYS.get(' '.join(parts[i].split()).lower())
+        if key is not None and key not in sections:
+            sections[key] = parts[i + 1].strip()
     
-    explanation = explanation_match.group(1).strip() if explanation_match else "Explanation not available."
-    errors = errors_match.group(1).strip() if errors_match else "Error analysis not available."
-    improved_code = improved_match.group(1).strip() if improved_match else "# Improved code not available."
+    explanation = sections.get('explanation', _SECTION_DEFAULTS['explanation'])
+    errors = sections.get('errors', _SECTION_DEFAULTS['errors'])
+    improved_code = sections.get('improved_code', _SECTION_DEFAULTS['improved_code'])
     
     return {
         'explanation': explanation,
@@ -150,15 +268,267 @@ def parse_llm_response(response_text: str) -> Dict[str, str]:
     }
 
 
-def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Optional[str]]:
+class SectionStreamParser:
+    """
+    Incrementally split streamed LLM text into section deltas.
+    
+    Feed text chunks as they arrive; each call returns events of the form
+    {"section": <key>, "delta": <text>}. Concatenating the deltas of a section
+    gives close to the text parse_llm_response would return for it: line
+    endings are normalized, but trailing spaces on a line may be kept, and a
+    final header line without a newline still opens its section. Text is
+    released as soon as it cannot be the start of a ### header line.
+    """
+    
+    def __init__(self):
+        self.section: Optional[str] = None
+        self.seen: List[str] = []
+        self.buffer = ''
+        # Whether the section has content yet, and blank lines held back
+        # until more content shows they are not trailing whitespace
+        self.started = False
+        self.pending_newlines = 0
+        # Whether part of the current line has already been emitted
+        self.line_open = False
+    
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        """Consume a chunk of streamed text and return the resulting events."""
+        events = []
+        self.buffer += text.replace('\r', '')
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            events.extend(self._end_line(line))
+        
+        if self.buffer and self.section is not None:
+            if self.line_open:
+                events.append(self._event(self.buffer))
+                self.buffer = ''
+            elif not '###'.startswith(self.buffer.lstrip(' \t')[:3]):
+                events.extend(self._start_line(self.buffer))
+                self.line_open = True
+                self.buffer = ''
+        return events
+    
+    def close(self) -> List[Dict[str, str]]:
+        """Flush buffered text and emit placeholders for sections never seen."""
+        events = self._end_line(self.buffer) if self.buffer else []
+        self.buffer = ''
+        for key, default in _SECTION_DEFAULTS.items():
+            if key not in self.seen:
+                events.append({'section': key, 'delta': default})
+        return events
+    
+    def _event(self, delta: str) -> Dict[str, str]:
+        return {'section': self.section, 'delta': delta}
+    
+    def _start_line(self, text: str) -> List[Dict[str, str]]:
+        if not self.started:
+            self.started = True
+            return [self._event(text.lstrip())]
+        prefix = '\n' * (self.pending_newlines + 1)
+        self.pending_newlines = 0
+        return [self._event(prefix + text)]
+    
+    def _end_line(self, line: str) -> List[Dict[str, str]]:
+        if self.line_open:
+            self.line_open = False
+            return [self._event(line)] if line else []
+        
+        header = _HEADER_LINE_RE.fullmatch(line)
+        if header:
+            key = _SECTION_KEYS.get(' '.join(header.group(1).split()).lower())
+            # As in parse_llm_response, the first occurrence of a header wins
+            self.section = key if key not in self.seen else None
+            self.started = False
+            self.pending_newlines = 0
+            if self.section is None:
+                return []
+            self.seen.append(self.section)
+            # Announce the section even if its body turns out to be empty
+            return [self._event('')]
+        
+        if self.section is None:
+            return []
+        if not line.strip():
+            if self.started:
+                self.pending_newlines += 1
+            return []
+        return self._start_line(line)
+
+
+@functools.lru_cache(maxsize=None)
+def _provider_for(api_url: str) -> str:
+    """
+    Identify the LLM provider from its API URL.
+    
+    Memoized per URL, so detection runs once per process for the configured
+    LLM_API_URL while still following overridden settings in tests.
+    """
+    api_url_lower = api_url.lower()
+    if 'serper' in api_url_lower:
+        return 'serper'
+    elif 'generativelanguage.googleapis.com' in api_url_lower or 'gemini' in api_url_lower:
+        return 'gemini'
+    elif 'openai' in api_url_lower:
+        return 'openai'
+    elif 'anthropic' in api_url_lower:
+        return 'anthropic'
+    return 'generic'
+
+
+def _build_request_serper(language: str, code: str) -> Dict:
+    """Serper API (Google Search API) format."""
+    # Build search queries for code explanation
+    # Extract first few lines of code for search
+    code_lines = code.split('\n')[:5]
+    code_preview = ' '.join(code_lines[:3])
+    search_query = f"{language} code explanation {code_preview}"
+    
+    data = {
+        "q": search_query,
+        "num": 5  # Get top 5 results
+    }
+    return data
+
+
+def _build_request_gemini(language: str, code: str) -> Dict:
+    """Google Gemini format."""
+    data = {
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": build_prompt(language, code)
+                    }
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": settings.LLM_TEMPERATURE,
+            "maxOutputTokens": 2000,
+        }
+    }
+    return data
+
+
+def _build_request_openai(language: str, code: str) -> Dict:
+    """OpenAI format."""
+    data = {
+        "model": "gpt-4",  # or "gpt-3.5-turbo" - can be made configurable
+        "messages": [{"role": "user", "content": build_prompt(language, code)}],
+        "temperature": settings.LLM_TEMPERATURE,
+        "max_tokens": 2000,
+    }
+    return data
+
+
+def _build_request_anthropic(language: str, code: str) -> Dict:
+    """Anthropic format."""
+    data = {
+        "model": "claude-3-opus-20240229",  # or "claude-3-sonnet-20240229"
+        "max_tokens": 2000,
+        "messages": [{"role": "user", "content": build_prompt(language, code)}]
+    }
+    return data
+
+
+def _build_request_generic(language: str, code: str) -> Dict:
+    """Generic format (default)."""
+    data = {
+        "prompt": build_prompt(language, code),
+        "temperature": settings.LLM_TEMPERATURE,
+        "max_tokens": 2000,
+    }
+    return data
+
+
+# Provider name -> request body builder
+_BUILDERS = {
+    'serper': _build_request_serper,
+    'gemini': _build_request_gemini,
+    'openai': _build_request_openai,
+    'anthropic': _build_request_anthropic,
+    'generic': _build_request_generic,
+}
+
+
+# Provider name -> request headers for a given API key
+_HEADERS = {
+    'serper': lambda api_key: {
+        "X-API-KEY": api_key,
+        "Content-Type": "application/json"
+    },
+    'gemini': lambda api_key: {
+        "Content-Type": "application/json",
+        "x-goog-api-key": api_key
+    },
+    'openai': lambda api_key: {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    },
+    'anthropic': lambda api_key: {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "Content-Type": "application/json"
+    },
+    'generic': lambda api_key: {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _headers_for(provider: str, api_key: str) -> Dict[str, str]:
+    """
+    Build the request headers for a provider once per API key.
+    
+    The returned dict is shared between requests and must not be mutated.
+    """
+    return _HEADERS[provider](api_key)
+
+
+def _build_request(language: str, code: str) -> Tuple[Dict, Dict[str, str]]:
+    """
+    Build the provider-specific request body and headers.
+    
+    Only the body, which carries the prompt, is built per call; headers are
+    constant for the configured provider and key, so they are reused.
+    
+    Returns:
+        Tuple of (data, headers)
+    """
+    provider = _provider_for(settings.LLM_API_URL)
+    return _BUILDERS[provider](language, code), _headers_for(provider, settings.LLM_API_KEY)
+
+
+def _cache_key(language: str, code: str) -> Tuple[str, bytes]:
+    """Build the explanation cache key for a snippet."""
+    return language, hashlib.blake2b(code.encode(), digest_size=16).digest()
+
+
+def clear_cache() -> None:
+    """Drop all cached explanations."""
+    with _cache_lock:
+        _cache.clear()
+
+
+async def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Optional[str]]:
     """
     Call the external LLM API to get code explanation.
     
+    Successful results are cached in memory, so repeat submissions of the
+    same snippet are answered without contacting the provider. When the
+    semantic cache is enabled, near-duplicate snippets are answered from it
+    as well. Concurrent misses for the same snippet share one provider call.
+    
     This function is designed to work with generic REST APIs. To adapt it for
     a specific provider (e.g., OpenAI, Anthropic):
     
-    1. Modify the request body structure in the 'data' variable
-    2. Adjust headers if needed (some providers use different auth schemes)
+    1. Modify the request body structure in the provider's request builder
+       (e.g. _build_request_openai), or add a builder to _BUILDERS
+    2. Adjust the provider's entry in _HEADERS if needed (some providers use
+       different auth schemes)
     3. Update the response parsing if the API returns a different format
     
     Example for OpenAI:
@@ -176,118 +546,102 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
     Returns:
         Tuple of (success: bool, result: Dict[str, str], error_message: Optional[str])
     """
+    cached, embedding = await _cache_lookup(language, code)
+    if cached is not None:
+        return True, cached, None
+    
+    # Only on a miss is the provider request (prompt included) built
+    success, result, error_message = await _fetch(language, code)
+    if success:
+        _cache_store(language, code, result, embedding)
+    return success, result, error_message
+
+
+async def _cache_lookup(language: str, code: str) -> Tuple[Optional[Dict[str, str]], Optional[object]]:
+    """
+    Look a snippet up in the exact-match cache, then the semantic cache.
+    
+    Returns:
+        Tuple of (cached result or None, embedding to pass to _cache_store)
+    """
+    key = _cache_key(language, code)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return dict(cached), None
+    
+    embedding = await semantic_cache.embed(language, code)
+    if embedding is not None:
+        similar = semantic_cache.search(language, embedding)
+        if similar is not None:
+            with _cache_lock:
+                _cache[key] = dict(similar)
+            return similar, embedding
+    return None, embedding
+
+
+def _cache_store(language: str, code: str, result: Dict[str, str], embedding: Optional[object]) -> None:
+    """Remember a fresh result in the exact-match and semantic caches."""
+    with _cache_lock:
+        _cache[_cache_key(language, code)] = dict(result)
+    if embedding is not None:
+        semantic_cache.add(language, embedding, result)
+
+
+async def _fetch(language: str, code: str) -> Tuple[bool, Dict[str, str], Optional[str]]:
+    """Get a fresh result from the provider, joining an identical call already in flight."""
+    inflight = _loop_local(_inflight, dict)
+    key = _cache_key(language, code)
+    task = inflight.get(key)
+    if task is None:
+        task = inflight[key] = asyncio.ensure_future(_call_llm_api_uncached(language, code))
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # A caller going away (e.g. client disconnect) must not cancel the call
+    # for the others waiting on it
+    return await asyncio.shield(task)
+
+
+async def _call_llm_api_uncached(language: str, code: str) -> Tuple[bool, Dict[str, str], Optional[str]]:
+    """Call the LLM API without consulting the explanation cache."""
     if not settings.LLM_API_URL:
         return False, {}, "LLM_API_URL not configured"
     
     if not settings.LLM_API_KEY:
         return False, {}, "LLM_API_KEY not configured"
     
-    prompt = build_prompt(language, code)
-    
-    # Detect provider and format request accordingly
-    api_url_lower = settings.LLM_API_URL.lower()
+    data, headers = _build_request(language, code)
+    provider = _provider_for(settings.LLM_API_URL)
     
-    # Serper API (Google Search API) format
-    if 'serper.dev' in api_url_lower or 'serper' in api_url_lower:
-        # Build search queries for code explanation
-        # Extract first few lines of code for search
-        code_lines = code.split('\n')[:5]
-        code_preview = ' '.join(code_lines[:3])
-        search_query = f"{language} code explanation {code_preview}"
-        
-        data = {
-            "q": search_query,
-            "num": 5  # Get top 5 results
-        }
-        headers = {
-            "X-API-KEY": settings.LLM_API_KEY,
-            "Content-Type": "application/json"
-        }
-    # Google Gemini format
-    elif 'generativelanguage.googleapis.com' in api_url_lower or 'gemini' in api_url_lower:
-        data = {
-            "contents": [
-                {
-                    "parts": [
-                        {
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            "generationConfig": {
-                "temperature": settings.LLM_TEMPERATURE,
-                "maxOutputTokens": 2000,
-            }
-        }
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": settings.LLM_API_KEY
-        }
-    # OpenAI format
-    elif 'openai' in api_url_lower:
-        data = {
-            "model": "gpt-4",  # or "gpt-3.5-turbo" - can be made configurable
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": settings.LLM_TEMPERATURE,
-            "max_tokens": 2000,
-        }
-        headers = {
-            "Authorization": f"Bearer {settings.LLM_API_KEY}",
-            "Content-Type": "application/json"
-        }
-    # Anthropic format
-    elif 'anthropic' in api_url_lower:
-        data = {
-            "model": "claude-3-opus-20240229",  # or "claude-3-sonnet-20240229"
-            "max_tokens": 2000,
-            "messages": [{"role": "user", "content": prompt}]
-        }
-        headers = {
-            "x-api-key": settings.LLM_API_KEY,
-            "anthropic-version": "2023-06-01",
-            "Content-Type": "application/json"
-        }
-    # Generic format (default)
-    else:
-        data = {
-            "prompt": prompt,
-            "temperature": settings.LLM_TEMPERATURE,
-            "max_tokens": 2000,
-        }
-        headers = {
-            "Authorization": f"Bearer {settings.LLM_API_KEY}",
-            "Content-Type": "application/json"
-        }
+    client = _get_client()
     
     try:
         # Retry with exponential backoff for rate limits
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    settings.LLM_API_URL,
-                    json=data,
-                    headers=headers,
-                    timeout=30
-                )
+                async with _get_semaphore():
+                    response = await client.post(
+                        settings.LLM_API_URL,
+                        content=orjson.dumps(data),
+                        headers=headers
+                    )
                 
                 # Handle rate limiting (429) with special retry logic
                 if response.status_code == 429:
                     # Check for Retry-After header
                     retry_after = response.headers.get('Retry-After')
-                    if retry_after:
-                        try:
-                            wait_time = int(retry_after)
-                        except ValueError:
-                            wait_time = (2 ** attempt) * 5  # Exponential backoff: 5s, 10s, 20s
-                    else:
-                        # Exponential backoff: 5s, 10s, 20s
-                        wait_time = (2 ** attempt) * 5
+                    try:
+                        retry_after = int(retry_after) if retry_after else None
+                    except ValueError:
+                        retry_after = None
                     
                     if attempt < max_retries - 1:
-                        # Wait before retrying
-                        time.sleep(wait_time)
+                        # Wait before retrying: honour Retry-After exactly,
+                        # otherwise jittered exponential backoff of ~5s, 10s, 20s
+                        if retry_after is not None:
+                            await asyncio.sleep(retry_after)
+                        else:
+                            await _backoff((2 ** attempt) * 5)
                         continue
                     else:
                         # Last attempt failed
@@ -300,10 +654,10 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
                 response.raise_for_status()
                 
                 # Parse response - adapt based on your provider's format
-                response_data = response.json()
+                response_data = orjson.loads(response.content)
                 
                 # Serper API response format (search results)
-                if 'serper.dev' in api_url_lower or 'serper' in api_url_lower:
+                if provider == 'serper':
                     # Parse Serper search results and format as code explanation
                     response_text = parse_serper_response(response_data, language, code)
                 # Try common response formats
@@ -317,9 +671,9 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
                         if parts and len(parts) > 0 and 'text' in parts[0]:
                             response_text = parts[0]['text']
                         else:
-                            response_text = json.dumps(response_data)
+                            response_text = orjson.dumps(response_data).decode()
                     else:
-                        response_text = json.dumps(response_data)
+                        response_text = orjson.dumps(response_data).decode()
                 # OpenAI-style format
                 elif 'choices' in response_data and len(response_data['choices']) > 0:
                     response_text = response_data['choices'][0].get('message', {}).get('content', '')
@@ -332,23 +686,23 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
                     response_text = response_data['content']
                 else:
                     # Fallback: use entire response as string
-                    response_text = json.dumps(response_data)
+                    response_text = orjson.dumps(response_data).decode()
                 
                 parsed = parse_llm_response(response_text)
                 return True, parsed, None
                 
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 if attempt == max_retries - 1:
                     return False, {}, "Request timeout - LLM API did not respond in time. Please try again."
                 # Wait before retrying timeout
-                time.sleep(2 ** attempt)
+                await _backoff(2 ** attempt)
                 continue
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 # Handle other HTTP errors
                 if e.response.status_code == 429:
                     # This shouldn't happen as we handle 429 above, but just in case
                     if attempt < max_retries - 1:
-                        time.sleep((2 ** attempt) * 5)
+                        await _backoff((2 ** attempt) * 5)
                         continue
                     return False, {}, (
                         f"Rate limit exceeded. Please wait a few minutes before trying again. "
@@ -361,17 +715,17 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
                 elif e.response.status_code >= 500:
                     # Server errors - retry with backoff
                     if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)
+                        await _backoff(2 ** attempt)
                         continue
                     return False, {}, f"LLM API server error ({e.response.status_code}). Please try again later."
                 else:
                     # Other HTTP errors
                     return False, {}, f"LLM API error ({e.response.status_code}): {str(e)}"
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 if attempt == max_retries - 1:
                     return False, {}, f"Network error: {str(e)}. Please check your internet connection and try again."
                 # Wait before retrying network errors
-                time.sleep(2 ** attempt)
+                await _backoff(2 ** attempt)
                 continue
                 
     except Exception as e:
@@ -379,3 +733,166 @@ def call_llm_api(language: str, code: str) -> Tuple[bool, Dict[str, str], Option
     
     return False, {}, "Failed to get response from LLM API"
 
+
+def _streaming_request(language: str, code: str) -> Optional[Tuple[str, Dict, Dict[str, str], Dict[str, str]]]:
+    """
+    Build a request for the provider's server-sent events interface.
+    
+    Returns:
+        Tuple of (url, data, headers, query params), or None if the provider
+        cannot stream
+    """
+    provider = _provider_for(settings.LLM_API_URL)
+    
+    # Google Gemini streams from a sibling endpoint
+    if provider == 'gemini':
+        if ':generateContent' not in settings.LLM_API_URL:
+            return None
+        data, headers = _build_request(language, code)
+        url = settings.LLM_API_URL.replace(':generateContent', ':streamGenerateContent')
+        return url, data, headers, {'alt': 'sse'}
+    # OpenAI and Anthropic stream when asked to
+    elif provider in ('openai', 'anthropic'):
+        data, headers = _build_request(language, code)
+        return settings.LLM_API_URL, {**data, 'stream': True}, headers, {}
+    # Serper and generic APIs have no streaming interface
+    return None
+
+
+def _extract_stream_text(event: Dict) -> str:
+    """Return the text carried by one streamed event, if any."""
+    # OpenAI: {"choices": [{"delta": {"content": "..."}}]}
+    choices = event.get('choices')
+    if choices:
+        return choices[0].get('delta', {}).get('content') or ''
+    # Gemini: {"candidates": [{"content": {"parts": [{"text": "..."}]}}]}
+    candidates = event.get('candidates')
+    if candidates:
+        parts = candidates[0].get('content', {}).get('parts') or [{}]
+        return parts[0].get('text', '')
+    # Anthropic: {"type": "content_block_delta", "delta": {"text": "..."}}
+    if event.get('type') == 'content_block_delta':
+        return event.get('delta', {}).get('text', '')
+    return ''
+
+
+def _stream_event_error(event: Dict) -> Optional[str]:
+    """Return the error reported by one streamed event, if it is an error frame."""
+    # Anthropic: {"type": "error", "error": {"message": "..."}}
+    # OpenAI and Gemini: {"error": {"message": "..."}}
+    if event.get('type') != 'error' and 'error' not in event:
+        return None
+    error = event.get('error')
+    message = error.get('message') if isinstance(error, dict) else error
+    return f"LLM API error: {message or 'the stream reported an error'}"
+
+
+def _stream_error_message(status_code: int) -> str:
+    """Describe an HTTP error status returned by the provider."""
+    if status_code == 429:
+        return (
+            "Rate limit exceeded. Please wait a few minutes before trying again. "
+            "(Error: 429 Too Many Requests)"
+        )
+    elif status_code == 401:
+        return "Invalid API key. Please check your LLM_API_KEY in the .env file."
+    elif status_code == 403:
+        return "API access forbidden. Please check your API key permissions."
+    elif status_code >= 500:
+        return f"LLM API server error ({status_code}). Please try again later."
+    return f"LLM API error ({status_code})"
+
+
+def _result_events(result: Dict[str, str]) -> List[Dict]:
+    """Represent a complete result as one delta per section."""
+    return [{'section': key, 'delta': result[key]} for key in _SECTION_DEFAULTS]
+
+
+async def stream_llm_api(language: str, code: str) -> AsyncIterator[Dict]:
+    """
+    Stream a code explanation section by section as the LLM generates it.
+    
+    Yields {"section": ..., "delta": ...} events followed by
+    {"done": true, "result": {...}}, or ends with an {"error": ...} event if
+    the request fails, possibly after some section events. The final result
+    is parsed from the complete response, as it is cached, and may differ
+    slightly from the concatenated deltas (e.g. in trailing whitespace).
+    Failed streams are not cached. Cached results are replayed immediately,
+    and providers without a streaming interface fall back to a regular
+    request, yielding each section whole.
+    
+    Args:
+        language: Programming language ('python' or 'cpp')
+        code: User's code snippet
+    """
+    cached, embedding = await _cache_lookup(language, code)
+    if cached is not None:
+        for event in _result_events(cached):
+            yield event
+        yield {'done': True, 'result': cached}
+        return
+    
+    stream_request = None
+    if settings.LLM_API_URL and settings.LLM_API_KEY:
+        stream_request = _streaming_request(language, code)
+    
+    if stream_request is None:
+        success, result, error_message = await _fetch(language, code)
+        if not success:
+            yield {'error': error_message or 'Failed to get explanation'}
+            return
+        _cache_store(language, code, result, embedding)
+        for event in _result_events(result):
+            yield event
+        yield {'done': True, 'result': result}
+        return
+    
+    url, data, headers, params = stream_request
+    parser = SectionStreamParser()
+    chunks = []
+    try:
+        async with _get_semaphore():
+            async with _get_client().stream(
+                'POST', url, content=orjson.dumps(data), headers=headers, params=params
+            ) as response:
+                if response.status_code >= 400:
+                    yield {'error': _stream_error_message(response.status_code)}
+                    return
+                async for line in response.aiter_lines():
+                    # Server-sent events: only "data:" lines carry payloads
+                    if not line.startswith('data:'):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == '[DONE]':
+                        break
+                    try:
+                        event = orjson.loads(payload)
+                    except ValueError:
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    error_message = _stream_event_error(event)
+                    if error_message is not None:
+                        yield {'error': error_message}
+                        return
+                    text = _extract_stream_text(event)
+                    if text:
+                        chunks.append(text)
+                        for event in parser.feed(text):
+                            yield event
+    except httpx.TimeoutException:
+        yield {'error': "Request timeout - LLM API did not respond in time. Please try again."}
+        return
+    except httpx.HTTPError as e:
+        yield {'error': f"Network error: {str(e)}. Please check your internet connection and try again."}
+        return
+    
+    if not chunks:
+        yield {'error': "LLM API returned an empty response. Please try again."}
+        return
+    result = parse_llm_response(''.join(chunks))
+    _cache_store(language, code, result, embedding)
+    
+    for event in parser.close():
+        yield event
+    yield {'done': True, 'result': result}
@@ -1,52 +1,174 @@
 """
 Rate limiting middleware for API endpoints.
 """
+import os
+import threading
 import time
+import redis
+import redis.asyncio
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from cachetools import TTLCache
 from django.http import JsonResponse
 from django.conf import settings
-from collections import defaultdict
+from collections import deque
 
 
-# In-memory rate limiter (simple implementation)
-# For production, consider using Redis or django-ratelimit
-_rate_limit_store = defaultdict(list)
+# In-memory rate limiter used when REDIS_URL is not configured.
+# Only suitable for a single process, e.g. local development.
+# Maps hash(IP) -> deque of request timestamps. Entries expire one window after the
+# IP's last recorded request, and the store is bounded so IP churn cannot
+# grow it without limit.
+_rate_limit_store = TTLCache(maxsize=10_000, ttl=settings.RATE_LIMIT_WINDOW)
+_rate_limit_lock = threading.Lock()
+
+# Seconds to wait on Redis before failing open, so an unreachable or hung
+# Redis cannot stall every API request.
+_REDIS_TIMEOUT = 0.1
+
+# Trims the IP's window, then records the request only if it is under the
+# limit, so rejected requests never count. Runs atomically in one round-trip.
+# KEYS[1]: sorted set key; ARGV: now, window seconds, max requests, member.
+# Returns 1 if the request is rate limited, else 0.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 1
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], window)
+return 0
+"""
 
 
 class RateLimitMiddleware:
     """
-    Simple in-memory rate limiting middleware.
+    Sliding-window rate limiting middleware.
     
     Limits requests per IP address based on RATE_LIMIT_REQUESTS and RATE_LIMIT_WINDOW.
+    Request timestamps are kept in a Redis sorted set per IP when REDIS_URL is set,
+    so the limit is shared by all workers; otherwise they are kept in process memory.
+    
+    Supports both sync and async request handling, so under ASGI async views
+    are not adapted to run on a worker thread for the whole request.
     """
     
+    sync_capable = True
+    async_capable = True
+    
     def __init__(self, get_response):
         self.get_response = get_response
         self.max_requests = settings.RATE_LIMIT_REQUESTS
         self.window_seconds = settings.RATE_LIMIT_WINDOW
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        
+        self.redis = None
+        if settings.REDIS_URL:
+            redis_class = redis.asyncio.Redis if self.is_async else redis.Redis
+            self.redis = redis_class.from_url(
+                settings.REDIS_URL,
+                socket_timeout=_REDIS_TIMEOUT,
+                socket_connect_timeout=_REDIS_TIMEOUT
+            )
+            self._record_request = self.redis.register_script(_SLIDING_WINDOW_LUA)
     
     def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        
+        # Only rate limit API endpoints
+        if request.path.startswith('/api/'):
+            ip_address = self._get_client_ip(request)
+            current_time = time.time()
+            
+            if self.redis is not None:
+                limited = self._is_rate_limited_redis(ip_address, current_time)
+            else:
+                limited = self._is_rate_limited_local(ip_address, current_time)
+            
+            if limited:
+                return self._limit_exceeded_response()
+        
+        return self.get_response(request)
+    
+    async def __acall__(self, request):
         # Only rate limit API endpoints
         if request.path.startswith('/api/'):
             ip_address = self._get_client_ip(request)
             current_time = time.time()
             
+            if self.redis is not None:
+                limited = await self._is_rate_limited_redis_async(ip_address, current_time)
+            else:
+                # Never waits on I/O, so it is safe to run on the event loop
+                limited = self._is_rate_limited_local(ip_address, current_time)
+            
+            if limited:
+                return self._limit_exceeded_response()
+        
+        return await self.get_response(request)
+    
+    def _limit_exceeded_response(self):
+        return JsonResponse(
+            {'error': f'Rate limit exceeded. Maximum {self.max_requests} requests per {self.window_seconds // 60} minutes.'},
+            status=429
+        )
+    
+    def _script_args(self, ip_address, current_time):
+        """Build the sliding-window script's keys and arguments for a request."""
+        # Unique member so concurrent requests with equal timestamps all count
+        member = f'{current_time}:{os.urandom(4).hex()}'
+        return {
+            'keys': [f'rl:{ip_address}'],
+            'args': [current_time, self.window_seconds, self.max_requests, member],
+        }
+    
+    def _is_rate_limited_redis(self, ip_address, current_time):
+        """
+        Record the request in Redis and report whether the limit is exceeded.
+        
+        Trimming, counting and recording happen atomically in one round-trip.
+        Fails open if Redis is unreachable or slow to answer.
+        """
+        try:
+            return bool(self._record_request(**self._script_args(ip_address, current_time)))
+        except redis.RedisError:
+            return False
+    
+    async def _is_rate_limited_redis_async(self, ip_address, current_time):
+        """Async counterpart of _is_rate_limited_redis."""
+        try:
+            return bool(await self._record_request(**self._script_args(ip_address, current_time)))
+        except redis.RedisError:
+            return False
+    
+    def _is_rate_limited_local(self, ip_address, current_time):
+        """Record the request in process memory and report whether the limit is exceeded."""
+        # Key by the IP's hash: a machine-word int is smaller than the address
+        # string, and is stable for the life of the process, which is all this
+        # store needs. 64-bit collisions are negligible at 10,000 entries.
+        ip_key = hash(ip_address)
+        
+        with _rate_limit_lock:
+            timestamps = _rate_limit_store.get(ip_key)
+            if timestamps is None:
+                timestamps = deque()
+            
             # Clean old entries outside the window
-            _rate_limit_store[ip_address] = [
-                timestamp for timestamp in _rate_limit_store[ip_address]
-                if current_time - timestamp < self.window_seconds
-            ]
+            while timestamps and current_time - timestamps[0] >= self.window_seconds:
+                timestamps.popleft()
             
             # Check if limit exceeded
-            if len(_rate_limit_store[ip_address]) >= self.max_requests:
-                return JsonResponse(
-                    {'error': f'Rate limit exceeded. Maximum {self.max_requests} requests per {self.window_seconds // 60} minutes.'},
-                    status=429
-                )
+            if len(timestamps) >= self.max_requests:
+                return True
             
-            # Record this request
-            _rate_limit_store[ip_address].append(current_time)
-        
-        return self.get_response(request)
+            # Record this request; re-storing refreshes the entry's expiry
+            timestamps.append(current_time)
+            _rate_limit_store[ip_key] = timestamps
+        return False
     
     def _get_client_ip(self, request):
         """Extract client IP address from request."""
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-15 08:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeExplanation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10)),
+                ('code', models.TextField()),
+                ('explanation', models.TextField()),
+                ('errors', models.TextField()),
+                ('improved_code', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['language', '-created_at'], name='explainers_lang_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-15 08:08
+
+from django.db import migrations, models
+
+
+# Admin search runs icontains, i.e. UPPER(col) LIKE UPPER('%term%'), which a
+# B-tree index cannot serve. On PostgreSQL, trigram GIN indexes on the same
+# expressions can; other databases keep scanning.
+SEARCH_FIELDS = ['code', 'explanation']
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS explainers_{field}_trgm_idx '
+            f'ON explainers_codeexplanation USING gin (UPPER({field}) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS explainers_{field}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explainers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='codeexplanation',
+            index=models.Index(fields=['-created_at'], name='explainers_created_idx'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
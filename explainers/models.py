@@ -15,4 +15,11 @@ class CodeExplanation(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Default ordering and the admin date filter
+            models.Index(fields=['-created_at'], name='explainers_created_idx'),
+            # Admin list filtering by language, newest first
+            models.Index(fields=['language', '-created_at'], name='explainers_lang_created_idx'),
+        ]
+        # On PostgreSQL, migration 0002 also adds trigram indexes for admin search
 
@@ -0,0 +1,124 @@
+"""
+Background persistence of code explanations.
+
+Saving a CodeExplanation on the request path would add a database round-trip
+to every explain call. Instead, views enqueue unsaved instances and a
+background worker writes them with bulk_create in batches of up to
+PERSIST_BATCH_SIZE, or after PERSIST_FLUSH_INTERVAL_MS when fewer arrive.
+
+The worker is a daemon thread rather than an asyncio task: sync (WSGI)
+deployments run each async view in a short-lived event loop, which would
+cancel a task-based flusher along with its loop.
+
+Explanations taken off the queue wait in a shared pending list until they
+are written, so flush() at exit also writes the batch the worker is still
+collecting. Failed writes are logged and the batch is dropped.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List
+from django.conf import settings
+from django.db import close_old_connections
+from .models import CodeExplanation
+
+
+logger = logging.getLogger(__name__)
+
+_queue: 'queue.SimpleQueue[CodeExplanation]' = queue.SimpleQueue()
+_worker = None
+_worker_lock = threading.Lock()
+
+# Explanations taken off the queue but not yet written. Guarded by
+# _write_lock, which is also held for the duration of each write so the
+# worker and flush() never write the same explanations twice.
+_pending: List[CodeExplanation] = []
+_write_lock = threading.Lock()
+
+
+def save_explanation(language: str, code: str, result: Dict[str, str]) -> None:
+    """
+    Queue an explanation for saving without touching the database.
+    
+    Does nothing unless PERSIST_EXPLANATIONS is enabled.
+    
+    Args:
+        language: Programming language ('python' or 'cpp')
+        code: User's code snippet
+        result: Dictionary with keys: explanation, errors, improved_code
+    """
+    if not settings.PERSIST_EXPLANATIONS:
+        return
+    _queue.put(CodeExplanation(
+        language=language,
+        code=code,
+        explanation=result.get('explanation', ''),
+        errors=result.get('errors', ''),
+        improved_code=result.get('improved_code', ''),
+    ))
+    _start_worker()
+
+
+def _start_worker() -> None:
+    """Start the background writer thread if it is not running."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='explanation-writer', daemon=True)
+            _worker.start()
+
+
+def _take_batch(timeout: float) -> None:
+    """Wait for a first item, then collect more until the batch is full or time is up."""
+    item = _queue.get()
+    with _write_lock:
+        _pending.append(item)
+    deadline = time.monotonic() + timeout
+    while True:
+        with _write_lock:
+            if len(_pending) >= settings.PERSIST_BATCH_SIZE:
+                return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            item = _queue.get(timeout=remaining)
+        except queue.Empty:
+            return
+        with _write_lock:
+            _pending.append(item)
+
+
+def _write_pending() -> None:
+    """Write and clear the pending explanations. The caller holds _write_lock."""
+    if not _pending:
+        return
+    batch = _pending[:]
+    _pending.clear()
+    try:
+        CodeExplanation.objects.bulk_create(batch, batch_size=settings.PERSIST_BATCH_SIZE)
+    except Exception:
+        # Persistence is best-effort; never let a bad batch kill the writer
+        logger.exception("Failed to save %d explanations", len(batch))
+
+
+def _run() -> None:
+    while True:
+        _take_batch(settings.PERSIST_FLUSH_INTERVAL_MS / 1000)
+        close_old_connections()
+        with _write_lock:
+            _write_pending()
+
+
+def flush() -> None:
+    """Write all queued and pending explanations in the calling thread."""
+    with _write_lock:
+        while True:
+            try:
+                _pending.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        _write_pending()
@@ -0,0 +1,146 @@
+"""
+Semantic cache for near-duplicate code snippets.
+
+Snippets that differ only in comments, whitespace or naming usually get the
+same explanation. This module embeds normalized code with a small
+sentence-transformer model and looks up the nearest previously explained
+snippet in a per-language FAISS index, reusing its result when the cosine
+similarity is above SEMANTIC_CACHE_THRESHOLD.
+
+The cache is disabled by default. Enabling it requires the optional
+``sentence-transformers`` and ``faiss-cpu`` packages.
+"""
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Comment syntax per supported language. C++ preprocessor lines start with '#'
+# and are significant, so only Python treats '#' as a comment.
+_COMMENT_RES = {
+    'python': re.compile(r'#[^\n]*'),
+    'cpp': re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL),
+}
+
+_model = None
+_model_lock = threading.Lock()
+
+# language -> _LanguageIndex
+_indexes: Dict[str, '_LanguageIndex'] = {}
+_indexes_lock = threading.Lock()
+
+
+def normalize_code(language: str, code: str) -> str:
+    """
+    Strip comments and collapse whitespace so formatting-only edits embed alike.
+    
+    Args:
+        language: Programming language ('python' or 'cpp')
+        code: User's code snippet
+    
+    Returns:
+        Normalized code string
+    """
+    comment_re = _COMMENT_RES.get(language)
+    if comment_re is not None:
+        code = comment_re.sub('', code)
+    return ' '.join(code.split())
+
+
+class _LanguageIndex:
+    """Inner-product FAISS index with FIFO eviction for one language."""
+    
+    def __init__(self, dimension: int, max_entries: int):
+        import faiss
+        self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+        self.max_entries = max_entries
+        self.results: 'OrderedDict[int, Dict[str, str]]' = OrderedDict()
+        self.next_id = 0
+        self.lock = threading.Lock()
+    
+    def search(self, embedding, threshold: float) -> Optional[Dict[str, str]]:
+        with self.lock:
+            if not self.results:
+                return None
+            scores, ids = self.index.search(embedding.reshape(1, -1), 1)
+            if ids[0][0] < 0 or scores[0][0] < threshold:
+                return None
+            return self.results.get(int(ids[0][0]))
+    
+    def add(self, embedding, result: Dict[str, str]) -> None:
+        import numpy as np
+        with self.lock:
+            if len(self.results) >= self.max_entries:
+                oldest_id, _ = self.results.popitem(last=False)
+                self.index.remove_ids(np.array([oldest_id], dtype='int64'))
+            self.index.add_with_ids(embedding.reshape(1, -1), np.array([self.next_id], dtype='int64'))
+            self.results[self.next_id] = result
+            self.next_id += 1
+
+
+def _get_model():
+    """Load the sentence-transformer model on first use."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                import faiss  # noqa: F401
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    "SEMANTIC_CACHE_ENABLED requires the 'sentence-transformers' "
+                    "and 'faiss-cpu' packages"
+                ) from e
+            _model = SentenceTransformer(settings.SEMANTIC_CACHE_MODEL)
+        return _model
+
+
+def _get_index(language: str, dimension: int) -> _LanguageIndex:
+    with _indexes_lock:
+        index = _indexes.get(language)
+        if index is None:
+            index = _LanguageIndex(dimension, settings.SEMANTIC_CACHE_SIZE)
+            _indexes[language] = index
+        return index
+
+
+def _encode(text: str):
+    return _get_model().encode(text, normalize_embeddings=True).astype('float32')
+
+
+async def embed(language: str, code: str):
+    """
+    Embed a snippet for semantic lookup.
+    
+    Encoding is CPU-bound, so it runs in a worker thread.
+    
+    Returns:
+        Normalized float32 embedding, or None when the cache is disabled
+    """
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    return await asyncio.to_thread(_encode, normalize_code(language, code))
+
+
+def search(language: str, embedding) -> Optional[Dict[str, str]]:
+    """Return the cached result of the most similar snippet above the threshold."""
+    index = _indexes.get(language)
+    if index is None:
+        return None
+    result = index.search(embedding, settings.SEMANTIC_CACHE_THRESHOLD)
+    return dict(result) if result is not None else None
+
+
+def add(language: str, embedding, result: Dict[str, str]) -> None:
+    """Remember a successful result under the snippet's embedding."""
+    _get_index(language, embedding.shape[-1]).add(embedding, dict(result))
+
+
+def clear() -> None:
+    """Drop all semantic cache entries."""
+    with _indexes_lock:
+        _indexes.clear()
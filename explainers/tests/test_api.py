@@ -2,9 +2,11 @@
 Tests for API endpoints.
 """
 import json
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch
+import httpx
 from django.test import TestCase, Client
 from django.urls import reverse
+from explainers import llm_client
 
 
 class ExplainAPITestCase(TestCase):
@@ -18,9 +20,9 @@ class ExplainAPITestCase(TestCase):
     def test_explain_api_valid_request(self):
         """Test that a valid request returns expected JSON structure."""
         # Mock LLM response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'text': """### Explanation
+        def mock_llm(request):
+            return httpx.Response(200, json={
+                'text': """### Explanation
 This code calculates the sum of numbers from 1 to n.
 
 ### Errors
@@ -32,10 +34,11 @@ def sum_numbers(n):
         raise ValueError("n must be non-negative")
     return sum(range(1, n + 1))
 """
-        }
-        mock_response.raise_for_status = Mock()
+            })
         
-        with patch('explainers.llm_client.requests.post', return_value=mock_response):
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(mock_llm))
+        
+        with patch('explainers.llm_client._get_client', return_value=mock_client):
             with patch('explainers.llm_client.settings.LLM_API_URL', 'http://test-api.com'):
                 with patch('explainers.llm_client.settings.LLM_API_KEY', 'test-key'):
                     response = self.client.post(
@@ -64,6 +67,11 @@ def sum_numbers(n):
         data = json.loads(response.content)
         self.assertIn('error', data)
     
+    def test_explain_api_rejects_get(self):
+        """Test that non-POST requests return 405."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+    
     def test_explain_api_missing_language(self):
         """Test that missing language returns 400."""
         response = self.client.post(
@@ -105,9 +113,20 @@ def sum_numbers(n):
         data = json.loads(response.content)
         self.assertIn('error', data)
     
+    def test_explain_api_overlong_line(self):
+        """Test that a single line over the line length limit returns 400."""
+        code = 'x = 1\n' + 'y' * 10001
+        response = self.client.post(
+            self.url,
+            data=json.dumps({'language': 'python', 'code': code}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Line exceeds', json.loads(response.content)['error'])
+    
     def test_explain_api_llm_failure(self):
         """Test that LLM API failure returns 500."""
-        with patch('explainers.llm_client.call_llm_api', return_value=(False, {}, 'API error')):
+        with patch('explainers.views.call_llm_api', AsyncMock(return_value=(False, {}, 'API error'))):
             response = self.client.post(
                 self.url,
                 data=json.dumps({
@@ -118,5 +137,119 @@ def sum_numbers(n):
             )
         self.assertEqual(response.status_code, 500)
         data = json.loads(response.content)
-        self.assertIn('error', data)
+        self.assertEqual(data['error'], 'API error')
 
+
+class ExplainStreamAPITestCase(TestCase):
+    """Test cases for the streaming explain API endpoint."""
+    
+    url = '/api/explain/stream/'
+    
+    def setUp(self):
+        """Start with an empty explanation cache."""
+        llm_client.clear_cache()
+        self.addCleanup(llm_client.clear_cache)
+    
+    async def post_and_read_events(self, body):
+        response = await self.async_client.post(self.url, data=json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        return [json.loads(line) for line in content.decode().splitlines()]
+    
+    async def test_stream_emits_section_deltas(self):
+        """Test that SSE chunks from the provider are relayed as section events."""
+        chunks = ['### Explanation\nSays ', 'hi.\n\n### Errors\nNone\n', '### Improved Code\nprint("hi")\n']
+        sse = ''.join(f'data: {json.dumps({"choices": [{"delta": {"content": c}}]})}\n\n' for c in chunks)
+        sse += 'data: [DONE]\n\n'
+        sent = []
+        
+        def mock_llm(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, text=sse, headers={'Content-Type': 'text/event-stream'})
+        
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(mock_llm))
+        with patch('explainers.llm_client._get_client', return_value=mock_client):
+            with patch('explainers.llm_client.settings.LLM_API_URL', 'https://api.openai.com/v1/chat/completions'):
+                with patch('explainers.llm_client.settings.LLM_API_KEY', 'test-key'):
+                    events = await self.post_and_read_events({'language': 'python', 'code': 'print("hi")'})
+        
+        self.assertTrue(sent[0]['stream'])
+        self.assertEqual(events[-1], {'done': True})
+        sections = {}
+        for event in events[:-1]:
+            sections[event['section']] = sections.get(event['section'], '') + event['delta']
+        self.assertEqual(sections, {'explanation': 'Says hi.', 'errors': 'None', 'improved_code': 'print("hi")'})
+    
+    async def stream_from_provider(self, api_url, payloads):
+        """Post a request while the provider at api_url streams the given SSE payloads."""
+        sse = ''.join(f'data: {json.dumps(payload)}\n\n' for payload in payloads)
+        
+        def mock_llm(request):
+            return httpx.Response(200, text=sse, headers={'Content-Type': 'text/event-stream'})
+        
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(mock_llm))
+        with patch('explainers.llm_client._get_client', return_value=mock_client):
+            with patch('explainers.llm_client.settings.LLM_API_URL', api_url):
+                with patch('explainers.llm_client.settings.LLM_API_KEY', 'test-key'):
+                    with patch('explainers.views.persistence.save_explanation') as save:
+                        events = await self.post_and_read_events({'language': 'python', 'code': 'print("hi")'})
+        return events, save
+    
+    async def test_stream_error_frame_ends_stream_uncached(self):
+        """Test that a provider error frame is relayed and the partial text is not kept."""
+        events, save = await self.stream_from_provider('https://api.anthropic.com/v1/messages', [
+            {'type': 'content_block_delta', 'delta': {'text': '### Explanation\nPartial'}},
+            {'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'Overloaded'}},
+        ])
+        self.assertEqual(events[-1], {'error': 'LLM API error: Overloaded'})
+        self.assertNotIn({'done': True}, events)
+        self.assertEqual(len(llm_client._cache), 0)
+        save.assert_not_called()
+    
+    async def test_stream_saves_the_cached_result(self):
+        """Test that the saved explanation is the parsed result the cache holds."""
+        text = '### Explanation\nSays hi.   \n### Errors\nNone\n### Improved Code\nprint("hi")'
+        events, save = await self.stream_from_provider('https://api.openai.com/v1/chat/completions', [
+            {'choices': [{'delta': {'content': text}}]},
+        ])
+        self.assertEqual(events[-1], {'done': True})
+        expected = {'explanation': 'Says hi.', 'errors': 'None', 'improved_code': 'print("hi")'}
+        save.assert_called_once_with('python', 'print("hi")', expected)
+        self.assertEqual(list(llm_client._cache.values()), [expected])
+    
+    async def test_stream_without_text_is_an_error(self):
+        """Test that a stream carrying no text is reported as a failure, not cached."""
+        events, save = await self.stream_from_provider('https://api.openai.com/v1/chat/completions', [
+            {'choices': [{'delta': {}}]},
+        ])
+        self.assertEqual(len(events), 1)
+        self.assertIn('error', events[0])
+        self.assertEqual(len(llm_client._cache), 0)
+        save.assert_not_called()
+    
+    async def test_non_streaming_provider_builds_request_once(self):
+        """Test that the regular-request fallback does not build the request twice."""
+        def mock_serper(request):
+            return httpx.Response(200, json={'organic': [{'title': 'Docs', 'snippet': 'Prints text.'}]})
+        
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(mock_serper))
+        with patch('explainers.llm_client._get_client', return_value=mock_client):
+            with patch('explainers.llm_client.settings.LLM_API_URL', 'https://google.serper.dev/search'):
+                with patch('explainers.llm_client.settings.LLM_API_KEY', 'test-key'):
+                    with patch('explainers.llm_client._build_request', wraps=llm_client._build_request) as build:
+                        events = await self.post_and_read_events({'language': 'python', 'code': 'print("hi")'})
+        self.assertEqual(events[-1], {'done': True})
+        self.assertEqual(build.call_count, 1)
+    
+    async def test_stream_reports_llm_failure_in_band(self):
+        """Test that an unconfigured LLM API yields a single error event."""
+        with patch('explainers.llm_client.settings.LLM_API_URL', ''):
+            events = await self.post_and_read_events({'language': 'python', 'code': 'print("hi")'})
+        self.assertEqual(len(events), 1)
+        self.assertIn('error', events[0])
+    
+    def test_stream_invalid_json(self):
+        """Test that invalid JSON returns 400 before streaming starts."""
+        response = self.client.post(self.url, data='invalid json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,36 @@
+"""
+Tests for the ASGI application's lifespan handling.
+"""
+from django.test import TestCase
+from ai_code_explainer.asgi import application
+from explainers import llm_client
+
+
+class LifespanTestCase(TestCase):
+    """Test cases for lifespan startup and shutdown."""
+    
+    async def run_lifespan(self, *message_types):
+        """Drive the application through lifespan messages and return what it sent."""
+        messages = iter([{'type': message_type} for message_type in message_types])
+        sent = []
+        
+        async def receive():
+            return next(messages)
+        
+        async def send(message):
+            sent.append(message['type'])
+        
+        await application({'type': 'lifespan'}, receive, send)
+        return sent
+    
+    async def test_startup_and_shutdown_complete(self):
+        """Test that both lifespan phases are acknowledged."""
+        sent = await self.run_lifespan('lifespan.startup', 'lifespan.shutdown')
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+    
+    async def test_shutdown_closes_pooled_client(self):
+        """Test that shutdown closes the running loop's pooled HTTP client."""
+        client = llm_client._get_client()
+        await self.run_lifespan('lifespan.startup', 'lifespan.shutdown')
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(llm_client._get_client(), client)
@@ -0,0 +1,192 @@
+"""
+Tests for the LLM client request path.
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+import httpx
+from django.test import TestCase
+from explainers import llm_client
+
+
+LLM_TEXT = """### Explanation
+Prints a greeting.
+
+### Errors
+None
+
+### Improved Code
+print("hello")
+"""
+
+
+class ProviderDetectionTestCase(TestCase):
+    """Test cases for provider detection from the API URL."""
+    
+    def test_providers_are_detected_from_url(self):
+        """Test that each supported provider URL maps to its request builder."""
+        urls = {
+            'https://google.serper.dev/search': 'serper',
+            'https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent': 'gemini',
+            'https://api.openai.com/v1/chat/completions': 'openai',
+            'https://api.anthropic.com/v1/messages': 'anthropic',
+            'http://localhost:5000/api/chat': 'generic',
+        }
+        for url, provider in urls.items():
+            self.assertEqual(llm_client._provider_for(url), provider)
+            self.assertIn(provider, llm_client._BUILDERS)
+            self.assertIn(provider, llm_client._HEADERS)
+    
+    def test_headers_are_reused_per_api_key(self):
+        """Test that request headers are built once and follow LLM_API_KEY."""
+        api_url = 'https://api.openai.com/v1/chat/completions'
+        with self.settings(LLM_API_URL=api_url, LLM_API_KEY='key-1'):
+            _, first = llm_client._build_request('python', 'x = 1')
+            _, second = llm_client._build_request('python', 'y = 2')
+        with self.settings(LLM_API_URL=api_url, LLM_API_KEY='key-2'):
+            _, rotated = llm_client._build_request('python', 'x = 1')
+        self.assertIs(first, second)
+        self.assertEqual(first['Authorization'], 'Bearer key-1')
+        self.assertEqual(rotated['Authorization'], 'Bearer key-2')
+
+
+class _SlowOpenLoop:
+    """Stand-in for a live event loop whose is_closed() check yields the GIL."""
+    
+    def is_closed(self):
+        time.sleep(0.001)
+        return False
+
+
+class LoopLocalTestCase(TestCase):
+    """Test cases for per-event-loop state."""
+    
+    def test_loops_on_concurrent_threads_get_their_own_state(self):
+        """Test that threads each running their own loop can share the registries."""
+        errors = []
+        
+        def run_loop():
+            try:
+                asyncio.run(self._get_semaphore_twice())
+            except Exception as e:
+                errors.append(e)
+        
+        # A long stale-loop sweep gives other threads time to add their entries
+        with patch.dict(llm_client._semaphores, {_SlowOpenLoop(): None for _ in range(20)}):
+            threads = [threading.Thread(target=run_loop) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+    
+    async def _get_semaphore_twice(self):
+        self.assertIs(llm_client._get_semaphore(), llm_client._get_semaphore())
+
+
+class CallLLMAPITestCase(TestCase):
+    """Test cases for call_llm_api."""
+    
+    def setUp(self):
+        """Start every test with an empty cache and a counting mock provider."""
+        llm_client.clear_cache()
+        self.calls = 0
+        
+        self.failures = 0
+        
+        def handler(request):
+            self.calls += 1
+            if self.calls <= self.failures:
+                return httpx.Response(503)
+            return httpx.Response(200, json={'text': LLM_TEXT})
+        
+        self.transport = httpx.MockTransport(handler)
+        patchers = [
+            patch('explainers.llm_client._get_client',
+                  side_effect=lambda: httpx.AsyncClient(transport=self.transport)),
+            patch('explainers.llm_client.settings.LLM_API_URL', 'http://test-api.com'),
+            patch('explainers.llm_client.settings.LLM_API_KEY', 'test-key'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(llm_client.clear_cache)
+    
+    async def test_repeat_request_is_served_from_cache(self):
+        """Test that an identical snippet only reaches the provider once."""
+        first = await llm_client.call_llm_api('python', 'print("hello")')
+        second = await llm_client.call_llm_api('python', 'print("hello")')
+        self.assertEqual(first, second)
+        self.assertTrue(second[0])
+        self.assertEqual(self.calls, 1)
+    
+    async def test_cache_hit_skips_request_building(self):
+        """Test that a cache hit does not build the prompt or provider request."""
+        await llm_client.call_llm_api('python', 'print("hello")')
+        with patch('explainers.llm_client._build_request') as build_request:
+            success, _, _ = await llm_client.call_llm_api('python', 'print("hello")')
+        self.assertTrue(success)
+        build_request.assert_not_called()
+    
+    async def test_cache_is_keyed_by_language(self):
+        """Test that the same code in another language is not a cache hit."""
+        await llm_client.call_llm_api('python', 'x = 1')
+        await llm_client.call_llm_api('cpp', 'x = 1')
+        self.assertEqual(self.calls, 2)
+    
+    async def test_failures_are_not_cached(self):
+        """Test that failed calls are retried on the next request."""
+        with patch('explainers.llm_client.settings.LLM_API_KEY', ''):
+            success, _, _ = await llm_client.call_llm_api('python', 'x = 1')
+        self.assertFalse(success)
+        success, _, _ = await llm_client.call_llm_api('python', 'x = 1')
+        self.assertTrue(success)
+        self.assertEqual(self.calls, 1)
+    
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """Test that concurrent misses for the same snippet share one provider call."""
+        results = await asyncio.gather(
+            *(llm_client.call_llm_api('python', 'print("hi")') for _ in range(3))
+        )
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(llm_client._loop_local(llm_client._inflight, dict), {})
+    
+    async def test_concurrent_distinct_requests_are_not_shared(self):
+        """Test that each concurrent snippet gets its own provider call."""
+        results = await asyncio.gather(
+            llm_client.call_llm_api('python', 'a = 1'),
+            llm_client.call_llm_api('cpp', 'a = 1'),
+        )
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertEqual(self.calls, 2)
+    
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test that other callers still get the result when one of them goes away."""
+        first = asyncio.ensure_future(llm_client.call_llm_api('python', 'x = 3'))
+        second = asyncio.ensure_future(llm_client.call_llm_api('python', 'x = 3'))
+        await asyncio.sleep(0)
+        first.cancel()
+        success, _, _ = await second
+        self.assertTrue(success)
+        self.assertEqual(self.calls, 1)
+    
+    async def test_server_errors_are_retried_with_backoff(self):
+        """Test that a 5xx response is retried after a backoff delay."""
+        self.failures = 1
+        with patch('explainers.llm_client._backoff', new_callable=AsyncMock) as backoff:
+            success, result, _ = await llm_client.call_llm_api('python', 'x = 2')
+        self.assertTrue(success)
+        self.assertEqual(self.calls, 2)
+        backoff.assert_awaited_once_with(1)
+    
+    async def test_backoff_is_jittered(self):
+        """Test that backoff delays stay within 50-150% of the base delay."""
+        with patch('explainers.llm_client.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            with patch('explainers.llm_client.random.random', side_effect=[0.0, 0.999]):
+                await llm_client._backoff(4)
+                await llm_client._backoff(4)
+        delays = [call.args[0] for call in sleep.await_args_list]
+        self.assertEqual(delays[0], 2.0)
+        self.assertAlmostEqual(delays[1], 5.996)
@@ -0,0 +1,109 @@
+"""
+Tests for the rate limiting middleware.
+"""
+from unittest.mock import AsyncMock, Mock, patch
+from asgiref.sync import iscoroutinefunction
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+import redis
+import redis.asyncio
+from explainers import middleware
+from explainers.middleware import RateLimitMiddleware
+
+
+@override_settings(RATE_LIMIT_REQUESTS=2, RATE_LIMIT_WINDOW=60)
+class RateLimitMiddlewareTestCase(TestCase):
+    """Test cases for RateLimitMiddleware."""
+    
+    def setUp(self):
+        """Set up a middleware instance around a trivial view."""
+        self.factory = RequestFactory()
+        middleware._rate_limit_store.clear()
+        self.addCleanup(middleware._rate_limit_store.clear)
+    
+    def make_middleware(self):
+        return RateLimitMiddleware(lambda request: HttpResponse('ok'))
+    
+    def make_async_middleware(self):
+        async def view(request):
+            return HttpResponse('ok')
+        return RateLimitMiddleware(view)
+    
+    @override_settings(REDIS_URL='')
+    def test_local_store_limits_api_requests(self):
+        """Test that requests beyond the limit are rejected with 429."""
+        mw = self.make_middleware()
+        statuses = [mw(self.factory.post('/api/explain/')).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+    
+    @override_settings(REDIS_URL='')
+    def test_local_store_window_slides(self):
+        """Test that requests are allowed again once old ones leave the window."""
+        mw = self.make_middleware()
+        with patch('explainers.middleware.time.time', side_effect=[1000, 1001, 1002, 1061]):
+            statuses = [mw(self.factory.post('/api/explain/')).status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 429, 200])
+    
+    @override_settings(REDIS_URL='')
+    def test_non_api_paths_are_not_limited(self):
+        """Test that only /api/ paths are rate limited."""
+        mw = self.make_middleware()
+        statuses = [mw(self.factory.get('/')).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 200])
+    
+    @override_settings(REDIS_URL='redis://localhost:6379/0')
+    def test_redis_client_has_short_timeouts(self):
+        """Test that a hung Redis cannot block requests for long."""
+        kwargs = self.make_middleware().redis.connection_pool.connection_kwargs
+        self.assertEqual(kwargs['socket_timeout'], middleware._REDIS_TIMEOUT)
+        self.assertEqual(kwargs['socket_connect_timeout'], middleware._REDIS_TIMEOUT)
+    
+    @override_settings(REDIS_URL='redis://localhost:6379/0')
+    def test_redis_store_rejects_over_limit(self):
+        """Test that a limited verdict from the Redis script rejects the request."""
+        mw = self.make_middleware()
+        mw._record_request = Mock(return_value=1)
+        response = mw(self.factory.post('/api/explain/', REMOTE_ADDR='10.0.0.1'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(mw._record_request.call_args.kwargs['keys'], ['rl:10.0.0.1'])
+    
+    @override_settings(REDIS_URL='redis://localhost:6379/0')
+    def test_redis_store_allows_within_limit(self):
+        """Test that an allowed verdict from the Redis script lets the request through."""
+        mw = self.make_middleware()
+        mw._record_request = Mock(return_value=0)
+        response = mw(self.factory.post('/api/explain/'))
+        self.assertEqual(response.status_code, 200)
+        mw._record_request.assert_called_once()
+    
+    @override_settings(REDIS_URL='redis://localhost:6379/0')
+    def test_redis_store_fails_open_on_timeout(self):
+        """Test that requests are allowed when Redis does not answer in time."""
+        mw = self.make_middleware()
+        mw._record_request = Mock(side_effect=redis.TimeoutError)
+        response = mw(self.factory.post('/api/explain/'))
+        self.assertEqual(response.status_code, 200)
+    
+    def test_async_handler_is_not_adapted(self):
+        """Test that the ASGI middleware chain runs without sync adaptation."""
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler().load_middleware(is_async=True)
+        self.assertTrue(iscoroutinefunction(self.make_async_middleware()))
+    
+    @override_settings(REDIS_URL='')
+    async def test_async_local_store_limits_api_requests(self):
+        """Test that the async path rejects requests beyond the limit."""
+        mw = self.make_async_middleware()
+        statuses = [(await mw(self.factory.post('/api/explain/'))).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+    
+    @override_settings(REDIS_URL='redis://localhost:6379/0')
+    async def test_async_redis_store_rejects_over_limit(self):
+        """Test that the async path uses the asyncio Redis client."""
+        mw = self.make_async_middleware()
+        self.assertIsInstance(mw.redis, redis.asyncio.Redis)
+        mw._record_request = AsyncMock(return_value=1)
+        response = await mw(self.factory.post('/api/explain/', REMOTE_ADDR='10.0.0.1'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(mw._record_request.call_args.kwargs['keys'], ['rl:10.0.0.1'])
@@ -0,0 +1,59 @@
+"""
+Tests for background persistence of explanations.
+"""
+from unittest.mock import patch
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from explainers import persistence
+from explainers.models import CodeExplanation
+
+
+RESULT = {'explanation': 'Prints hi.', 'errors': 'None', 'improved_code': 'print("hi")'}
+
+
+class PersistenceTestCase(TestCase):
+    """Test cases for queued explanation saving."""
+    
+    def setUp(self):
+        """Keep the writer thread out of the test; tests flush explicitly."""
+        patcher = patch('explainers.persistence._start_worker')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(persistence.flush)
+    
+    @override_settings(PERSIST_EXPLANATIONS=True)
+    def test_queued_explanations_are_bulk_saved(self):
+        """Test that queued explanations are written on flush, not on save."""
+        persistence.save_explanation('python', 'print("hi")', RESULT)
+        persistence.save_explanation('cpp', 'int x;', RESULT)
+        self.assertEqual(CodeExplanation.objects.count(), 0)
+        
+        persistence.flush()
+        self.assertEqual(CodeExplanation.objects.count(), 2)
+        saved = CodeExplanation.objects.get(language='python')
+        self.assertEqual(saved.code, 'print("hi")')
+        self.assertEqual(saved.improved_code, 'print("hi")')
+    
+    @override_settings(PERSIST_EXPLANATIONS=False)
+    def test_nothing_is_queued_when_disabled(self):
+        """Test that persistence is opt-in."""
+        persistence.save_explanation('python', 'print("hi")', RESULT)
+        persistence.flush()
+        self.assertEqual(CodeExplanation.objects.count(), 0)
+    
+    @override_settings(PERSIST_EXPLANATIONS=True)
+    def test_flush_writes_batch_taken_by_worker(self):
+        """Test that explanations the worker has taken but not written are not lost."""
+        persistence.save_explanation('python', 'print("hi")', RESULT)
+        persistence._take_batch(0)
+        persistence.flush()
+        self.assertEqual(CodeExplanation.objects.count(), 1)
+    
+    @override_settings(PERSIST_EXPLANATIONS=True)
+    def test_failed_write_is_logged(self):
+        """Test that a batch that cannot be written is reported, not silently dropped."""
+        persistence.save_explanation('python', 'print("hi")', RESULT)
+        with patch.object(CodeExplanation.objects, 'bulk_create', side_effect=DatabaseError('locked')):
+            with self.assertLogs('explainers.persistence', 'ERROR') as logs:
+                persistence.flush()
+        self.assertIn('Failed to save 1 explanations', logs.output[0])
@@ -2,7 +2,9 @@
 Tests for prompt building and parsing logic.
 """
 from django.test import TestCase
-from explainers.llm_client import build_prompt, parse_llm_response
+from explainers.llm_client import (
+    PROMPT_TEMPLATE, SectionStreamParser, build_prompt, parse_llm_response, parse_serper_response
+)
 
 
 class PromptTestCase(TestCase):
@@ -27,6 +29,13 @@ class PromptTestCase(TestCase):
         self.assertIn('### Errors', prompt)
         self.assertIn('### Improved Code', prompt)
     
+    def test_build_prompt_matches_template(self):
+        """Test that the prompt equals the fully formatted template."""
+        code = 'int main() { return 0; }'
+        for language in ('python', 'cpp'):
+            self.assertEqual(build_prompt(language, code),
+                             PROMPT_TEMPLATE.format(language=language, code=code))
+    
     def test_parse_llm_response_with_markers(self):
         """Test parsing LLM response with proper markers."""
         response = """### Explanation
@@ -56,6 +65,9 @@ print("Hello, World!")
         self.assertIsInstance(result['explanation'], str)
         self.assertIsInstance(result['errors'], str)
         self.assertIsInstance(result['improved_code'], str)
+        self.assertEqual(result['explanation'], 'Explanation not available.')
+        self.assertEqual(result['errors'], 'Error analysis not available.')
+        self.assertEqual(result['improved_code'], '# Improved code not available.')
     
     def test_parse_llm_response_partial_markers(self):
         """Test parsing LLM response with some markers missing."""
@@ -71,4 +83,99 @@ No errors found.
         self.assertIn('improved_code', result)
         self.assertIn('does something', result['explanation'].lower())
         self.assertIn('No errors', result['errors'])
+    
+    def test_parse_llm_response_ignores_preamble_and_unknown_sections(self):
+        """Test that text outside the known sections is not attributed to them."""
+        response = """Sure, here is the analysis.
+
+### Explanation
+Adds two numbers.
 
+### Notes
+Not part of any section.
+
+### Improved Code
+def add(a, b):
+    return a + b
+"""
+        result = parse_llm_response(response)
+        self.assertEqual(result['explanation'], 'Adds two numbers.')
+        self.assertEqual(result['errors'], 'Error analysis not available.')
+        self.assertEqual(result['improved_code'], 'def add(a, b):\n    return a + b')
+    
+    def test_parse_llm_response_accepts_deeper_headings(self):
+        """Test that #### headers are recognized like ### headers."""
+        response = "#### Explanation\nA\n#### Errors\nB\n#### Improved Code\nC\n"
+        self.assertEqual(parse_llm_response(response), {'explanation': 'A', 'errors': 'B', 'improved_code': 'C'})
+        
+        parser = SectionStreamParser()
+        sections = {}
+        for event in parser.feed(response) + parser.close():
+            sections[event['section']] = sections.get(event['section'], '') + event['delta']
+        self.assertEqual(sections, parse_llm_response(response))
+    
+    def test_section_stream_parser_matches_parse_llm_response(self):
+        """Test that streamed deltas reassemble into the parsed sections."""
+        response = """### Explanation
+This code prints hello world.
+
+### Errors
+- None
+
+### Improved Code
+# Greet the user
+print("Hello, World!")
+"""
+        for chunk_size in (1, 3, 8, len(response)):
+            parser = SectionStreamParser()
+            events = []
+            for i in range(0, len(response), chunk_size):
+                events.extend(parser.feed(response[i:i + chunk_size]))
+            events.extend(parser.close())
+            
+            sections = {}
+            for event in events:
+                sections[event['section']] = sections.get(event['section'], '') + event['delta']
+            self.assertEqual(sections, parse_llm_response(response))
+    
+    def test_section_stream_parser_releases_text_before_line_ends(self):
+        """Test that partial lines are emitted once they cannot be a header."""
+        parser = SectionStreamParser()
+        parser.feed('### Explanation\n')
+        self.assertEqual(parser.feed('This code'), [{'section': 'explanation', 'delta': 'This code'}])
+        self.assertEqual(parser.feed(' runs'), [{'section': 'explanation', 'delta': ' runs'}])
+        self.assertEqual(parser.feed('\n##'), [])
+    
+    def test_section_stream_parser_announces_empty_sections(self):
+        """Test that a header with no body still produces its section key."""
+        response = "### Explanation\nPrints x.\n### Errors\n### Improved Code\nprint(x)\n"
+        parser = SectionStreamParser()
+        events = parser.feed(response) + parser.close()
+        
+        sections = {}
+        for event in events:
+            sections[event['section']] = sections.get(event['section'], '') + event['delta']
+        self.assertEqual(sections, parse_llm_response(response))
+        self.assertEqual(sections['errors'], '')
+    
+    def test_parse_serper_response_collects_error_snippets(self):
+        """Test that snippets mentioning errors are listed case-insensitively."""
+        serper_data = {'organic': [
+            {'title': 'Docs', 'snippet': 'How list comprehensions work.'},
+            {'title': 'Q&A', 'snippet': 'Common IndexError when slicing.'},
+            {'title': 'Blog', 'snippet': 'Debugging tips for beginners.'},
+        ]}
+        result = parse_llm_response(parse_serper_response(serper_data, 'python', 'x = [1]'))
+        self.assertIn('Docs: How list comprehensions work.', result['explanation'])
+        self.assertEqual(result['errors'], '- Common IndexError when slicing.\n- Debugging tips for beginners.')
+        self.assertEqual(result['improved_code'], 'x = [1]')
+    
+    def test_parse_serper_response_caps_both_sections(self):
+        """Test that explanation and errors each keep at most three snippets."""
+        serper_data = {
+            'answerBox': {'answer': 'A list.'},
+            'organic': [{'title': f'R{i}', 'snippet': f'Bug {i}'} for i in range(6)],
+        }
+        result = parse_llm_response(parse_serper_response(serper_data, 'python', 'x = [1]'))
+        self.assertEqual(result['explanation'], 'Based on search results:\n\nA list.\n\nR0: Bug 0\n\nR1: Bug 1')
+        self.assertEqual(result['errors'], '- Bug 0\n- Bug 1\n- Bug 2')
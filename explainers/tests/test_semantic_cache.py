@@ -0,0 +1,63 @@
+"""
+Tests for the semantic cache.
+"""
+import unittest
+from django.test import TestCase, override_settings
+from explainers import semantic_cache
+
+try:
+    import faiss  # noqa: F401
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class NormalizeCodeTestCase(TestCase):
+    """Test cases for code normalization."""
+    
+    def test_python_comments_and_whitespace_are_ignored(self):
+        """Test that formatting-only edits normalize to the same text."""
+        a = 'def add(a, b):\n    return a + b  # sum\n'
+        b = '# helper\ndef add(a, b):\n\n        return a + b'
+        self.assertEqual(semantic_cache.normalize_code('python', a),
+                         semantic_cache.normalize_code('python', b))
+    
+    def test_cpp_comments_are_stripped_but_preprocessor_kept(self):
+        """Test that C++ comments are removed while #include survives."""
+        code = '#include <iostream>\n/* block\ncomment */ int x = 1; // note\n'
+        self.assertEqual(semantic_cache.normalize_code('cpp', code),
+                         '#include <iostream> int x = 1;')
+
+
+@unittest.skipIf(np is None, 'faiss-cpu and numpy are required')
+@override_settings(SEMANTIC_CACHE_THRESHOLD=0.92, SEMANTIC_CACHE_SIZE=2)
+class SemanticIndexTestCase(TestCase):
+    """Test cases for nearest-neighbour lookup."""
+    
+    def setUp(self):
+        semantic_cache.clear()
+        self.addCleanup(semantic_cache.clear)
+    
+    @staticmethod
+    def vector(*values):
+        v = np.array(values, dtype='float32')
+        return v / np.linalg.norm(v)
+    
+    def test_similar_embedding_hits(self):
+        """Test that a close embedding returns the stored result."""
+        semantic_cache.add('python', self.vector(1, 0, 0), {'explanation': 'a'})
+        self.assertEqual(semantic_cache.search('python', self.vector(1, 0.1, 0)), {'explanation': 'a'})
+    
+    def test_dissimilar_embedding_or_language_misses(self):
+        """Test that distant embeddings and other languages do not hit."""
+        semantic_cache.add('python', self.vector(1, 0, 0), {'explanation': 'a'})
+        self.assertIsNone(semantic_cache.search('python', self.vector(0, 1, 0)))
+        self.assertIsNone(semantic_cache.search('cpp', self.vector(1, 0, 0)))
+    
+    def test_oldest_entry_is_evicted(self):
+        """Test that the index holds at most SEMANTIC_CACHE_SIZE entries."""
+        semantic_cache.add('python', self.vector(1, 0, 0), {'explanation': 'a'})
+        semantic_cache.add('python', self.vector(0, 1, 0), {'explanation': 'b'})
+        semantic_cache.add('python', self.vector(0, 0, 1), {'explanation': 'c'})
+        self.assertIsNone(semantic_cache.search('python', self.vector(1, 0, 0)))
+        self.assertEqual(semantic_cache.search('python', self.vector(0, 0, 1)), {'explanation': 'c'})
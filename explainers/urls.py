@@ -7,5 +7,6 @@ from . import views
 urlpatterns = [
     path('', views.index, name='index'),
     path('api/explain/', views.explain_api, name='explain_api'),
+    path('api/explain/stream/', views.explain_stream_api, name='explain_stream_api'),
 ]
 
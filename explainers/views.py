@@ -1,15 +1,32 @@
 """
 Views for the explainers app.
 """
-import json
+import re
 from typing import Tuple, Optional
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+import orjson
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.conf import settings
-from .llm_client import call_llm_api
+from . import persistence
+from .llm_client import call_llm_api, stream_llm_api
 from .serializers import ExplainRequestSerializer
 
 
+# Maximum characters per line of submitted code (guards against DoS)
+MAX_LINE_LENGTH = 10000
+
+# Matches any line longer than MAX_LINE_LENGTH. Anchoring at line starts keeps
+# the scan linear; unanchored, every position of a long line is retried.
+_LONG_LINE_RE = re.compile(r'^[^\n]{%d}' % (MAX_LINE_LENGTH + 1), re.MULTILINE)
+
+
+class OrjsonResponse(HttpResponse):
+    """JSON response serialized with orjson."""
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data), **kwargs)
+
+
 def index(request):
     """Render the home page."""
     from django.shortcuts import render
@@ -34,8 +51,7 @@ def validate_code_input(code: str) -> Tuple[bool, Optional[str]]:
         return False, f"Code exceeds maximum length of {settings.MAX_CODE_LENGTH} characters"
     
     # Check line count
-    lines = code.split('\n')
-    if len(lines) > settings.MAX_LINES:
+    if code.count('\n') + 1 > settings.MAX_LINES:
         return False, f"Code exceeds maximum of {settings.MAX_LINES} lines"
     
     # Sanitize: remove binary/null characters
@@ -43,53 +59,116 @@ def validate_code_input(code: str) -> Tuple[bool, Optional[str]]:
         return False, "Code contains invalid null characters"
     
     # Basic check for extremely long lines (potential DoS)
-    max_line_length = 10000
-    for line in lines:
-        if len(line) > max_line_length:
-            return False, f"Line exceeds maximum length of {max_line_length} characters"
+    if _LONG_LINE_RE.search(code):
+        return False, f"Line exceeds maximum length of {MAX_LINE_LENGTH} characters"
     
     return True, None
 
 
-@require_http_methods(["POST"])
-def explain_api(request):
+def _parse_explain_request(request) -> Tuple[Optional[Tuple[str, str]], Optional[OrjsonResponse]]:
+    """
+    Parse and validate an explain request body.
+    
+    Returns:
+        Tuple of ((language, code), None) if valid, or (None, error_response)
+    """
+    # Parse JSON request
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return None, OrjsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    # Validate with serializer
+    serializer = ExplainRequestSerializer(data=data)
+    if not serializer.is_valid():
+        return None, OrjsonResponse({'error': serializer.errors}, status=400)
+    
+    language = serializer.validated_data['language']
+    code = serializer.validated_data['code']
+    
+    # Validate code input
+    is_valid, error_msg = validate_code_input(code)
+    if not is_valid:
+        return None, OrjsonResponse({'error': error_msg}, status=400)
+    
+    return (language, code), None
+
+
+def _internal_error_message(e: Exception) -> str:
+    """Describe an unexpected error to the client."""
+    # In production, log this but don't expose internal errors
+    if settings.DEBUG:
+        return f'Internal error: {str(e)}'
+    return 'An internal error occurred'
+
+
+async def explain_api(request):
     """
     API endpoint to explain code.
     
+    Async so the worker is released while waiting on the LLM provider.
+    
     Accepts JSON: {"language": "python"|"cpp", "code": "<code>"}
     Returns JSON: {"explanation": "...", "errors": "...", "improved_code": "..."}
     """
+    # require_http_methods only supports sync views on Django 4.2
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    
     try:
-        # Parse JSON request
-        try:
-            data = json.loads(request.body)
-        except json.JSONDecodeError:
-            return JsonResponse({'error': 'Invalid JSON'}, status=400)
-        
-        # Validate with serializer
-        serializer = ExplainRequestSerializer(data=data)
-        if not serializer.is_valid():
-            return JsonResponse({'error': serializer.errors}, status=400)
-        
-        language = serializer.validated_data['language']
-        code = serializer.validated_data['code']
-        
-        # Validate code input
-        is_valid, error_msg = validate_code_input(code)
-        if not is_valid:
-            return JsonResponse({'error': error_msg}, status=400)
+        parsed, error_response = _parse_explain_request(request)
+        if error_response is not None:
+            return error_response
+        language, code = parsed
         
         # Call LLM API
-        success, result, error_msg = call_llm_api(language, code)
+        success, result, error_msg = await call_llm_api(language, code)
         
         if not success:
-            return JsonResponse({'error': error_msg or 'Failed to get explanation'}, status=500)
+            return OrjsonResponse({'error': error_msg or 'Failed to get explanation'}, status=500)
         
-        return JsonResponse(result)
+        persistence.save_explanation(language, code, result)
+        return OrjsonResponse(result)
         
     except Exception as e:
-        # In production, log this but don't expose internal errors
-        if settings.DEBUG:
-            return JsonResponse({'error': f'Internal error: {str(e)}'}, status=500)
-        return JsonResponse({'error': 'An internal error occurred'}, status=500)
+        return OrjsonResponse({'error': _internal_error_message(e)}, status=500)
 
+
+async def explain_stream_api(request):
+    """
+    API endpoint to explain code, streaming sections as they are generated.
+    
+    Accepts JSON: {"language": "python"|"cpp", "code": "<code>"}
+    Returns newline-delimited JSON events:
+        {"section": "explanation"|"errors"|"improved_code", "delta": "..."}
+        ...
+        {"done": true}
+    or a final {"error": "..."} event if the LLM request fails.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    
+    try:
+        parsed, error_response = _parse_explain_request(request)
+        if error_response is not None:
+            return error_response
+        language, code = parsed
+    except Exception as e:
+        return OrjsonResponse({'error': _internal_error_message(e)}, status=500)
+    
+    async def events():
+        try:
+            async for event in stream_llm_api(language, code):
+                if event.get('done'):
+                    # Save the parsed result, which is also what the cache holds
+                    persistence.save_explanation(language, code, event.pop('result'))
+                yield orjson.dumps(event) + b'\n'
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield orjson.dumps({'error': _internal_error_message(e)}) + b'\n'
+    
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    # Ask reverse proxies such as nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
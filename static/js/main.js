@@ -171,8 +171,13 @@ function handleRequest(action) {
     // Get CSRF token
     const csrftoken = getCookie('csrftoken');
 
+    // The answer is rendered section by section as the stream arrives
+    let messageDiv = null;
+    let finished = false;
+    const sections = {};
+
     // Make API request
-    fetch('/api/explain/', {
+    fetch('/api/explain/stream/', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
@@ -189,21 +194,63 @@ function handleRequest(action) {
                 throw new Error(data.error || `HTTP error! status: ${response.status}`);
             });
         }
-        return response.json();
+        return readEventStream(response, event => {
+            if (event.error) {
+                throw new Error(event.error);
+            }
+            if (!messageDiv) {
+                // Replace the loading overlay with the answer as soon as it starts
+                showLoading(false);
+                messageDiv = addAssistantMessage();
+            }
+            if (event.section) {
+                sections[event.section] = (sections[event.section] || '') + event.delta;
+                renderAssistantMessage(messageDiv, sections, true);
+            } else if (event.done) {
+                finished = true;
+                renderAssistantMessage(messageDiv, sections, false);
+            }
+            scrollToBottom();
+        });
     })
-    .then(data => {
+    .then(() => {
+        if (!finished) {
+            throw new Error('The response ended unexpectedly. Please try again.');
+        }
         showLoading(false);
         setButtonsDisabled(false);
-        addAssistantMessage(data);
-        scrollToBottom();
     })
     .catch(error => {
         showLoading(false);
         setButtonsDisabled(false);
+        // Drop a partially streamed answer rather than leave it looking complete
+        if (messageDiv && !finished) {
+            messageDiv.remove();
+            messageCount--;
+        }
         showError(error.message || 'An error occurred while processing your request.');
     });
 }
 
+// Read a newline-delimited JSON response, calling onEvent for each event
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+    buffer += decoder.decode();
+    if (buffer.trim()) {
+        onEvent(JSON.parse(buffer));
+    }
+}
+
 function addUserMessage(code, language) {
     const chatMessages = document.getElementById('chat-messages');
     if (!chatMessages) return;
@@ -237,17 +284,13 @@ function addUserMessage(code, language) {
     scrollToBottom();
 }
 
-function addAssistantMessage(data) {
+function addAssistantMessage() {
     const chatMessages = document.getElementById('chat-messages');
-    if (!chatMessages) return;
+    if (!chatMessages) return null;
 
     const messageDiv = document.createElement('div');
     messageDiv.className = 'message assistant';
     
-    const explanation = data.explanation || 'No explanation available.';
-    const errors = formatErrors(data.errors || 'No errors found.');
-    const improvedCode = data.improved_code || 'No improved code available.';
-    
     messageDiv.innerHTML = `
         <div class="message-avatar">AI</div>
         <div class="message-content">
@@ -258,17 +301,17 @@ function addAssistantMessage(data) {
             <div class="message-body">
                 <div class="message-section">
                     <div class="message-section-title">Explanation</div>
-                    <div class="message-section-content">${formatText(explanation)}</div>
+                    <div class="message-section-content" data-section="explanation"></div>
                 </div>
                 <div class="message-section">
                     <div class="message-section-title">Potential Errors/Warnings</div>
-                    <div class="message-section-content">${errors}</div>
+                    <div class="message-section-content" data-section="errors"></div>
                 </div>
                 <div class="message-section">
                     <div class="message-section-title">Improved Code</div>
                     <div class="message-section-content">
                         <div class="message-actions">
-                            <button class="action-btn-small" onclick="copyCode(this)" data-code="${escapeHtml(improvedCode)}">
+                            <button class="action-btn-small" onclick="copyCode(this)" data-code="">
                                 <svg width="14" height="14" viewBox="0 0 14 14" fill="none">
                                     <path d="M9.5 1.5H4.5C3.67 1.5 3 2.17 3 3V9.5C3 10.33 3.67 11 4.5 11H9.5C10.33 11 11 10.33 11 9.5V3C11 2.17 10.33 1.5 9.5 1.5Z" stroke="currentColor" stroke-width="1.5"/>
                                     <path d="M7 7V11M7 7H11M7 7H3" stroke="currentColor" stroke-width="1.5" stroke-linecap="round"/>
@@ -276,7 +319,7 @@ function addAssistantMessage(data) {
                                 Copy
                             </button>
                         </div>
-                        <pre><code>${escapeHtml(improvedCode)}</code></pre>
+                        <pre><code data-section="improved_code"></code></pre>
                     </div>
                 </div>
             </div>
@@ -286,6 +329,22 @@ function addAssistantMessage(data) {
     chatMessages.appendChild(messageDiv);
     messageCount++;
     scrollToBottom();
+    return messageDiv;
+}
+
+// Fill an assistant message with the sections received so far. While the
+// answer is still streaming, sections that have not started are left empty.
+function renderAssistantMessage(messageDiv, data, partial) {
+    if (!messageDiv) return;
+
+    const explanation = data.explanation || (partial ? '' : 'No explanation available.');
+    const errors = data.errors || (partial ? '' : 'No errors found.');
+    const improvedCode = data.improved_code || (partial ? '' : 'No improved code available.');
+    
+    messageDiv.querySelector('[data-section="explanation"]').innerHTML = formatText(explanation);
+    messageDiv.querySelector('[data-section="errors"]').innerHTML = errors ? formatErrors(errors) : '';
+    messageDiv.querySelector('[data-section="improved_code"]').textContent = improvedCode;
+    messageDiv.querySelector('.action-btn-small').setAttribute('data-code', improvedCode);
 }
 
 function formatText(text) {